@@ -5,18 +5,28 @@ Uses Google Gemini 2.5 Flash as the LLM provider.
 
 import os
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Any, List, Optional
 
 import structlog
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, SystemMessage
 from langchain_core.tools import BaseTool
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel
 
-from app.agents.state import ExamHelperState
+from app.agents.state import ExamHelperState, get_conversation_context
 
 logger = structlog.get_logger(__name__)
 
+@lru_cache(maxsize=16)
+def _get_chat_model(model_name: str, temperature: float, api_key: Optional[str]) -> ChatGoogleGenerativeAI:
+    """Share one Gemini client (and its connection pool) per model configuration."""
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        google_api_key=api_key,
+        temperature=temperature,
+    )
+
 
 class BaseLLM(ABC):
     """Abstract base class for all agents with Gemini LLM functionality."""
@@ -27,10 +37,14 @@ class BaseLLM(ABC):
         api_key: Optional[str] = None,
         temperature: float = 0.7,
         model_name: str = "gemini-2.5-flash",
+        system_prompt: Optional[str] = None,
     ) -> None:
         self.agent_name = agent_name
         self.temperature = temperature
         self.model_name = model_name
+        self.system_prompt = system_prompt
+        # Built once: the prompt is static, so re-validating it per call is wasted work.
+        self._system_message = SystemMessage(content=system_prompt) if system_prompt else None
         self.model: Any = None
 
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
@@ -48,14 +62,10 @@ class BaseLLM(ABC):
 
     def _setup_model(self) -> None:
         try:
-            self.model = ChatGoogleGenerativeAI(
-                model=self.model_name,
-                google_api_key=self.api_key,
-                temperature=self.temperature,
-            )
+            self.model = _get_chat_model(self.model_name, self.temperature, self.api_key)
             logger.debug("Gemini model initialized", agent_name=self.agent_name)
-        except Exception as e:
-            logger.error("Failed to initialize model", error=str(e), agent_name=self.agent_name)
+        except Exception:
+            logger.error("Failed to initialize model", exc_info=True, agent_name=self.agent_name)
             raise
 
     @abstractmethod
@@ -78,14 +88,23 @@ class BaseAgent(BaseLLM):
         api_key: Optional[str] = None,
         temperature: float = 0.7,
         model_name: str = "gemini-2.5-flash",
+        system_prompt: Optional[str] = None,
     ) -> None:
         super().__init__(
             agent_name=agent_name,
             api_key=api_key,
             temperature=temperature,
             model_name=model_name,
+            system_prompt=system_prompt,
         )
 
+    def format_query(self, query: str, state: Optional[ExamHelperState] = None) -> str:
+        """Prefix the query with conversation context so the system prompt stays static."""
+        context = get_conversation_context(state) if state else ""
+        if not context:
+            return query
+        return f"CONVERSATION CONTEXT:\n{context}\n\nQUESTION:\n{query}"
+
     def get_tools(self) -> List[BaseTool]:
         """Get tools available to this agent. Override in subclasses."""
         return []
@@ -116,7 +135,7 @@ class BaseAgent(BaseLLM):
                 "error": [],
             }
         except Exception as e:
-            logger.error("Agent processing failed", error=str(e), agent_name=self.agent_name)
+            logger.error("Agent processing failed", exc_info=True, agent_name=self.agent_name)
             return {
                 "success": False,
                 self.get_result_key(): None,
@@ -18,7 +18,7 @@ class AgentFactoryConfig(BaseModel):
     orchestrator_agent: AgentConfig = Field(
         default_factory=lambda: AgentConfig(
             model_name=LLMModels.GEMINI_2_5_FLASH,
-            temperature=0.7,
+            temperature=0.0,
         )
     )
     explainer_agent: AgentConfig = Field(
@@ -3,66 +3,47 @@ Explainer Agent
 
 Helps user understand a certain concept easily, in a way that they can grasp
 """
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import structlog
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from pydantic import BaseModel
 
 from app.agents.agent_types import EXPLAINER_AGENT_NAME
 from app.agents.base_agent import BaseAgent
 from app.agents.llm_models import LLMModels
+from app.agents.prompt_loader import load_prompt
 from app.agents.state import ExamHelperState
 from app.models.response_models import ExamHelperResponse
+from app.utils.llm_cache import get_llm_cache
+from app.utils.semantic_cache import SemanticCache
 
 logger = structlog.get_logger(__name__)
 
 
-EXPLAINER_AGENT_PROMPT = """
+EXPLAINER_AGENT_PROMPT = load_prompt(__package__)
 
-## Persona
-You are a friendly, patient teacher who explains concepts like you're talking to a small child.  
-You love using simple words, tiny stories, and everyday examples.  
-You make learning feel safe, fun, and never scary.  
-A little humor is welcome — but keep it gentle and cute.
+# Embedding size for the semantic cache; gemini-embedding-001 supports truncation.
+SEMANTIC_CACHE_DIMENSIONS = 768
 
+_semantic_cache: Optional[SemanticCache] = None
 
-## Instructions
-- Explain concepts in **very simple language**
-- Assume the listener is a **small kid or complete beginner**
-- Use short sentences
-- Use relatable, real-life examples
-- Avoid big words (unless you explain them immediately)
-- Add light humor when appropriate
-- Keep responses under **150 words**
-- Always end with a friendly question or invitation to ask more
 
-
-## Chain of Thought 
-1. Find the core idea.
-2. Remove complicated words.
-3. Turn it into a simple real-world example.
-4. Add a small fun comparison or joke.
-5. Encourage curiosity at the end.
-
-## Few-Shot Examples
-
-### Example 1
-**User:** What is an API?  
-**Assistant:**  
-Imagine a restaurant. You don’t go into the kitchen to cook, right?  
-You tell the waiter what you want. The waiter brings your food.  
-
-An API is like that waiter.  
-It helps apps talk to each other and pass messages safely.  
-No shouting. No confusion. Just polite talking.  
-
-Cool, right? Want another example with games or phones?
-
-
-### So
-Explain everything slowly and kindly.  
-Make it feel like story time, not exam time.  
-Curious minds welcome. 😊"""
+def _get_semantic_cache(api_key: str) -> SemanticCache:
+    """Get the semantic cache shared by every ExplainerAgent instance."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            GoogleGenerativeAIEmbeddings(
+                model=LLMModels.GEMINI_EMBEDDING_001,
+                google_api_key=api_key,
+                task_type="SEMANTIC_SIMILARITY",
+                output_dimensionality=SEMANTIC_CACHE_DIMENSIONS,
+            )
+        )
+    return _semantic_cache
 
 
 class ExplainerAgent(BaseAgent):
@@ -80,16 +61,32 @@ class ExplainerAgent(BaseAgent):
             api_key=api_key,
             temperature=temperature,
             model_name=model_name,
+            system_prompt=EXPLAINER_AGENT_PROMPT,
         )
 
+    async def _semantic_lookup(self, query: str) -> Tuple[Optional[Any], Optional[np.ndarray]]:
+        """Look up a paraphrase of query; returns (cached value, query embedding)."""
+        try:
+            semantic_cache = _get_semantic_cache(self.api_key)
+            vector = await semantic_cache.embed(query)
+            return await semantic_cache.search(vector), vector
+        except Exception:
+            logger.warning("Semantic cache lookup failed", exc_info=True)
+            return None, None
+
+    @staticmethod
+    def _has_prior_turns(state: Optional[ExamHelperState]) -> bool:
+        """Check whether the conversation already has an assistant reply."""
+        messages = state.get("messages", []) if state else []
+        return any(isinstance(msg, AIMessage) for msg in messages)
+
     def get_result_key(self) -> str:
         return "explainer_agent_result"
 
     def get_prompt(self, state: Optional[ExamHelperState] = None) -> str:
-        from app.agents.state import get_conversation_context
-
-        context = get_conversation_context(state) if state else ""
-        return EXPLAINER_AGENT_PROMPT.format(context=context)
+        # Conversation context travels in the user turn (see format_query) so the
+        # system prompt stays a byte-identical prefix for Gemini's implicit caching.
+        return EXPLAINER_AGENT_PROMPT
 
     def get_response_format(self) -> type[BaseModel]:
         return ExamHelperResponse
@@ -101,14 +98,39 @@ class ExplainerAgent(BaseAgent):
     ) -> Dict[str, Any]:
         """Process a query and explain the user a certain concept."""
         try:
-            from langchain_core.messages import HumanMessage, SystemMessage
-
-            prompt = self.get_prompt(state)
-            messages = [
-                SystemMessage(content=prompt),
-                HumanMessage(content=query),
-            ]
-            response = await self.model.ainvoke(messages)
+            user_content = self.format_query(query, state)
+            user_message = HumanMessage(content=user_content)
+
+            llm_cache = get_llm_cache()
+            cache_key = llm_cache.cache_key(
+                self.model_name, [self.get_prompt(state), user_message], self.temperature
+            )
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                return {
+                    "success": True,
+                    self.get_result_key(): cached["content"],
+                    "error": [],
+                }
+
+            # Only standalone questions are matched semantically; a follow-up
+            # depends on earlier replies and must not reuse an answer. This
+            # costs an embedding call, so it runs after the in-memory lookup.
+            query_vector = None
+            if not self._has_prior_turns(state):
+                semantic_hit, query_vector = await self._semantic_lookup(query)
+                if semantic_hit is not None:
+                    return {
+                        "success": True,
+                        self.get_result_key(): semantic_hit["content"],
+                        "error": [],
+                    }
+
+            response = await self.model.ainvoke([self._system_message, user_message])
+
+            await llm_cache.set(cache_key, {"content": response.content})
+            if query_vector is not None:
+                _get_semantic_cache(self.api_key).add(query_vector, {"content": response.content})
 
             return {
                 "success": True,
@@ -116,7 +138,7 @@ class ExplainerAgent(BaseAgent):
                 "error": [],
             }
         except Exception as e:
-            logger.error("Explainer agent processing failed", error=str(e))
+            logger.error("Explainer agent processing failed", exc_info=True)
             return {
                 "success": False,
                 self.get_result_key(): None,
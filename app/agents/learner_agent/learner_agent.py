@@ -4,16 +4,20 @@ Learner Agent
 Helps user in providing learning material that can be used to study a certain concept
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 import structlog
+from langchain_core.messages import HumanMessage
+from langchain_core.tools import BaseTool
 from pydantic import BaseModel
 
 from app.agents.agent_types import LEARNER_AGENT_NAME
 from app.agents.base_agent import BaseAgent
 from app.agents.llm_models import LLMModels
+from app.agents.prompt_loader import load_prompt
 from app.agents.state import ExamHelperState
 from app.models.response_models import ExamHelperResponse
+from app.utils.llm_cache import get_llm_cache
 from langchain.agents import create_agent
 
 from app.tools.firecrawl_tool import get_learner_tools
@@ -21,223 +25,8 @@ from app.tools.firecrawl_tool import get_learner_tools
 logger = structlog.get_logger(__name__)
 
 
-LEARNER_AGENT_PROMPT = """
-PERSONA:
-You are a exam training expert that helps university students understand and present their answers in a proper way in the exam.
-You think in two aspects:
-- You are deeply trained in explaining concepts in-depth, starting from the why to actually explaining a concept and giving examples
-so that students can understand the concept and easily recollect it during the exam.
-- You are well-versed in providing the same concept in an exam ready format so that the students can learn it and present it 
-in the university exam long answer format that allows them to score maximum marks. 
-
-INSTRUCTIONS: 
-- Identify the topic that the user wants to study
-
-- Generate text and diagrams where ever required to explain the concepts relevant to the topic in depth
-
-- After providing an in depth explanation, provide a structured long answer. This long answer must be directly writable in a 
-university exam and MUST folow the given format:
-1. An introduction
-2. If relevant, a section on the core principles. The what, the why etc
-3. The main body - This section is the main reason for scoring good marks. This section must be divided into multiple
-sub headings and answered in bullet points. Each sub heading and the content below it must be stricty in sync with the question 
-asked. 
-If the question is theory, then this must cover:
-mechanism, characteristic, analysis
-If the question is about the working of a system, then this section must cover:
-the components, architecture, working, flow
-If the question is about comparison, this section must cover:
-a table that draws the differences 
-If relevant, this section must also contain a neat labelled diagram, followed by a clear explanation of what the diagram depicts. 
-- A conclusion section. Depending on the question, this can be about where a certain concept is applied or the advantages or 
-disadvantages or a general conclusion based on what is asked in the question. 
+LEARNER_AGENT_PROMPT = load_prompt(__package__)
 
-- You ensure that the answer is  optimised to score more marks by following these steps:
-1. Visible structure with clear definitions wherever required
-2. Using and highlighting key words
-3. Clear segmentation by using sub headings and writing bullet points under each subheading
-4. A neat and labelled diagram
-5. Use of standard text book terms and language
-6. Spacing, balanced length and equal focus on all sub topics rather than over explaining one sub topic while ignoring the rest
-7. A sense of completeness in the answer by providing a applications / advantages / conclusion section at the end 
-8. ALWAYS use complete sentences. Your answer must be atleast 2 pages long
-
-CHAIN OF THOUGHT: 
-- Understand the question asked 
-- Explain the important concepts that are required for the user to understand to lock in this topic. This explanation
-is an in depth explanation that convers all relevant concepts to understand the current topic. It is not a shallow one paragraph 
-kind of answer. Use diagrams if required. 
-- Extract the examinable dimensions from the concept and map them into a structured long-answer format that maximizes mark visibility
-- Ensure that the answer that adheres to the university expected format 
-- Ensure that the answer is optimised to score maximum marks 
-- Review for technical accuracy, clarity and consistency 
-
-TOOLS:
-You have access to a tool that retrieves high-quality academic and explanatory content.
-
-Use the tool when:
-- The topic requires deeper factual enrichment beyond core textbook knowledge
-- You need real-world applications, recent developments, case studies, or authoritative definitions
-- The user asks for detailed study material that would benefit from external references
-
-Do NOT use the tool when:
-- The concept is a standard university syllabus topic that can be fully explained from your internal knowledge
-- The question is purely theoretical and does not require external enrichment
-- You already have sufficient information to generate a complete, high-quality exam answer
-
-HOW TO USE THE TOOL OUTPUT:
-- Do NOT copy the retrieved content as it is
-- Extract only the relevant concepts
-- Integrate them into the structured exam-ready answer format
-- Ensure the final answer is cohesive and not a collection of pasted text
-
-FEW SHOT EXAMPLES: 
-EXAMPLE 1: 
-USER:
-Explain deadlock, conditions for deadlock and deadlock prevention techniques in detail.
-
-EXAM HELPER:
-
-EXPLANATION TO UNDERSTAND DEADLOCK
-
-Deadlock is a situation in which a group of processes becomes permanently blocked because each process is waiting for a resource 
-that is currently held by another process in the same group. This problem typically arises in a multiprogramming environment 
-where multiple processes compete for a limited number of resources such as memory, files, semaphores, or I/O devices.
-
-To understand deadlock intuitively, consider two processes where one process holds a printer and waits for a file, 
-while another process holds the file and waits for the printer. Since neither process can proceed without the other releasing 
-its resource, both processes remain blocked indefinitely. This circular dependency is the fundamental reason behind deadlock.
-
-Deadlock does not occur randomly; it happens only when four specific conditions occur simultaneously. These conditions are 
-mutual exclusion, hold and wait, no preemption, and circular wait. If even one of these conditions is eliminated, deadlock 
-can be prevented. Operating systems use this principle to design deadlock prevention and avoidance algorithms such as the 
-Banker’s algorithm.
-
-Understanding deadlock is important because it reduces system throughput, causes poor resource utilization, and may even 
-bring part of the system to a halt.
-
-LONG ANSWER FORMAT:
-
-A deadlock is a condition in an operating system in which a set of processes is permanently blocked because each process is 
-holding one or more resources and waiting for additional resources that are currently held by other processes in the set.
-
-Conditions required for deadlock to occour:
-
-The necessary conditions for the occurrence of a deadlock are as follows:
-
-• Mutual exclusion occurs when at least one resource is non-shareable and only one process can use the resource at a time.
-• Hold and wait occurs when a process is holding at least one resource and is waiting to acquire additional resources that are currently being held by other processes.
-• No preemption means that the operating system cannot forcibly take a resource away from a process and the resource must be released voluntarily.
-• Circular wait occurs when a circular chain of processes exists in which each process is waiting for a resource that is held by the next process in the chain.
-
-
-1. Deadlock System Model:
-
-• The system consists of a finite number of processes and a finite number of resource types, and each resource type has a fixed number of instances.
-• A process must request a resource before using it, and after using the resource it must release it so that it can be allocated to other processes.
-• If the requested resource is not available, the process enters a waiting state, which may eventually lead to a deadlock condition.
-
-2. Resource Allocation Graph:
-
-• A resource allocation graph is a directed graph used to represent the allocation and request of resources in the system.
-• A directed edge from a process to a resource indicates that the process is requesting the resource, while an edge from a resource to a process indicates that the resource has been allocated.
-• The presence of a cycle in the graph indicates the possibility of deadlock in the system.
-
-3. Methods for Handling Deadlock:
-
-a) Deadlock Prevention
-
-• Deadlock prevention eliminates one of the necessary conditions so that deadlock cannot occur in the system.
-• For example, the hold and wait condition can be eliminated by requiring processes to request all required resources at once.
-
-b) Deadlock Avoidance
-
-• Deadlock avoidance ensures that the system always remains in a safe state by using algorithms such as the Banker’s algorithm.
-• Resource allocation is done only if it does not lead the system into an unsafe state.
-
-c) Deadlock Detection and Recovery
-
-• In this method, deadlocks are allowed to occur and then detected using techniques such as the wait-for graph.
-• Recovery is done either by terminating processes or by preempting resources.
-
-Conclusion:
-
-Deadlock is a major problem in operating systems that affects system performance and resource utilization. It can be handled effectively using prevention, avoidance, detection, and recovery techniques.
-
-EXAMPLE 2: 
-USER:
-What is normalisation ? Why is it essential ? Explain about all the normal forms in detail.
-
-EXAM HELPER:
-
-EXPLANATION TO UNDERSTAND NORMALIZATION
-
-Normalization is a systematic process used in relational database design to minimize redundancy and eliminate undesirable
-characteristics such as insertion, deletion, and update anomalies. When data is stored in an unstructured manner in a 
-single large table, multiple problems arise. The same piece of information may be stored repeatedly, which leads to
-wastage of storage space and difficulty in maintaining consistency.
-
-For example, if a student table contains both student details and department details, the department information will 
-be repeated for every student belonging to that department. If the department location changes, it must be updated in 
-multiple rows. If one row is missed, the database becomes inconsistent. Normalization solves this problem by 
-decomposing a large relation into smaller relations and establishing relationships among them using keys.
-
-The process of normalization is based on functional dependencies, which describe the relationship between attributes. 
-By analysing these dependencies, the database designer can divide the relations into well-structured tables that
-ensure data integrity and reduce redundancy. Normal forms provide a step-by-step approach to achieve this goal.
-
-LONG ANSWER FORMAT:
-
-Normalization is the process of organizing data in a relational database to reduce redundancy and improve data integrity
-by decomposing relations based on functional dependencies.
-
-Need for Normalization:
-
-• Normalization reduces data redundancy by storing each data item in only one place.
-• It eliminates insertion, deletion, and update anomalies that occur in unnormalized relations.
-• It improves data consistency and simplifies database maintenance.
-
-Functional Dependency:
-
-• A functional dependency is a relationship between two attributes in which one attribute uniquely determines another attribute.
-• Functional dependencies are used to identify the candidate keys and to decompose relations during normalization.
-
-First Normal Form (1NF):
-
-• A relation is said to be in first normal form if it contains only atomic values and each field contains only a single value.
-• Repeating groups and multivalued attributes are eliminated to convert a relation into first normal form.
-
-Second Normal Form (2NF):
-
-• A relation is in second normal form if it is in first normal form and every non-prime attribute is fully functionally 
-dependent on the entire primary key.
-• Partial dependency is removed by decomposing the relation into smaller relations.
-
-Third Normal Form (3NF):
-
-• A relation is in third normal form if it is in second normal form and there is no transitive dependency.
-• Transitive dependency is removed by separating the dependent attributes into a new relation.
-
-Boyce–Codd Normal Form (BCNF):
-
-• A relation is in BCNF if for every functional dependency, the determinant is a super key.
-• BCNF is a stronger version of third normal form and removes certain anomalies that are not handled by 3NF.
-
-Advantages of Normalization:
-
-• Normalization reduces data redundancy and improves storage efficiency.
-• It eliminates modification anomalies and ensures data consistency.
-• It improves the logical organization of the database.
-
-Conclusion:
-
-Normalization is an essential technique in relational database design that organizes data into well-structured relations,
-reduces redundancy, and ensures data integrity.
-
-CONVERSATION CONTEXT:
-{context}
-
-"""
 
 def _extract_text_from_message(message) -> str:
     """
@@ -251,18 +40,27 @@ def _extract_text_from_message(message) -> str:
     content = message.content
 
     if isinstance(content, list):
-        parts = []
+        return "\n".join(filter(str.strip, map(_block_text, content)))
 
-        for block in content:
-            if isinstance(block, dict):
-                parts.append(block.get("text", ""))
-            elif isinstance(block, str):
-                parts.append(block)
-            else:
-                parts.append(str(block))
+    return content
+
+
+# Exact-type dispatch for content blocks; anything else is stringified.
+_BLOCK_TEXT: Dict[type, Callable[[Any], str]] = {
+    dict: lambda block: block.get("text") or "",
+    str: lambda block: block,
+}
 
-        return "\n".join(p for p in parts if p.strip())
 
+def _block_text(block: Any) -> str:
+    return _BLOCK_TEXT.get(type(block), str)(block)
+
+
+def _chunk_text(chunk) -> str:
+    """Text of a streamed chunk, unfiltered so deltas concatenate to the full answer."""
+    content = chunk.content
+    if isinstance(content, list):
+        return "".join(map(_block_text, content))
     return content
 
 class LearnerAgent(BaseAgent):
@@ -280,20 +78,40 @@ class LearnerAgent(BaseAgent):
             api_key=api_key,
             temperature=temperature,
             model_name=model_name,
+            system_prompt=LEARNER_AGENT_PROMPT,
         )
+        self._agent: Any = None
+        self._tools: Optional[List[BaseTool]] = None
 
     def get_result_key(self) -> str:
         return "learner_agent_result"
 
     def get_prompt(self, state: Optional[ExamHelperState] = None) -> str:
-        from app.agents.state import get_conversation_context
-
-        context = get_conversation_context(state) if state else ""
-        return LEARNER_AGENT_PROMPT.format(context=context)
+        # Conversation context travels in the user turn (see format_query) so a
+        # single compiled agent can be reused across queries.
+        return LEARNER_AGENT_PROMPT
 
     def get_response_format(self) -> type[BaseModel]:
         return ExamHelperResponse
 
+    def _get_agent(self) -> Any:
+        if self._agent is None:
+            self._tools = get_learner_tools()
+            self._agent = create_agent(
+                model=self.model,
+                tools=self._tools,
+                system_prompt=self._system_message,
+            )
+        return self._agent
+
+    def _cache_key(self, user_message: HumanMessage) -> Optional[str]:
+        return get_llm_cache().cache_key(
+            self.model_name,
+            [self.system_prompt, user_message],
+            self.temperature,
+            [tool.name for tool in self._tools or []],
+        )
+
     async def process_query(
         self,
         query: str,
@@ -301,25 +119,29 @@ class LearnerAgent(BaseAgent):
     ) -> Dict[str, Any]:
         """Process a query and provide related learning material"""
         try:
-            from langchain_core.messages import HumanMessage
-
-            prompt = self.get_prompt(state)
-
-            agent = create_agent(
-                model=self.model,
-                tools=get_learner_tools(),
-                system_prompt=prompt,
-            )
+            agent = self._get_agent()
+            user_message = HumanMessage(content=self.format_query(query, state))
+
+            llm_cache = get_llm_cache()
+            cache_key = self._cache_key(user_message)
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                return {
+                    "success": True,
+                    self.get_result_key(): cached["content"],
+                    "error": [],
+                }
 
             result = await agent.ainvoke(
                 {
                     "messages": [
-                        HumanMessage(content=query)
+                        user_message
                     ]
                 }
             )
 
             final_output = _extract_text_from_message(result["messages"][-1])
+            await llm_cache.set(cache_key, {"content": final_output})
 
             return {
                 "success": True,
@@ -328,9 +150,67 @@ class LearnerAgent(BaseAgent):
             }
 
         except Exception as e:
-            logger.error("Learner agent processing failed", error=str(e))
+            logger.error("Learner agent processing failed", exc_info=True)
             return {
                 "success": False,
                 self.get_result_key(): None,
                 "error": [str(e)],
-            }
\ No newline at end of file
+            }
+
+    async def process_query_stream(
+        self,
+        query: str,
+        state: Optional[ExamHelperState] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream learning material as it is generated.
+
+        Yields ``{"delta": text}`` for each generated chunk, then a final dict
+        shaped like the result of ``process_query``. If the model starts a new
+        turn after a tool call, ``{"reset": True}`` is yielded first: text
+        streamed before it was not part of the answer and should be discarded,
+        so the deltas after the last reset always add up to the final output.
+        """
+        try:
+            agent = self._get_agent()
+            user_message = HumanMessage(content=self.format_query(query, state))
+
+            llm_cache = get_llm_cache()
+            cache_key = self._cache_key(user_message)
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                yield {
+                    "success": True,
+                    self.get_result_key(): cached["content"],
+                    "error": [],
+                }
+                return
+
+            # Only the last model turn is the answer; earlier turns lead up to tool calls.
+            turn_parts: List[str] = []
+            async for event in agent.astream_events({"messages": [user_message]}, version="v2"):
+                if event["event"] == "on_chat_model_start":
+                    if turn_parts:
+                        turn_parts = []
+                        yield {"reset": True}
+                elif event["event"] == "on_chat_model_stream":
+                    delta = _chunk_text(event["data"]["chunk"])
+                    if delta:
+                        turn_parts.append(delta)
+                        yield {"delta": delta}
+
+            final_output = "".join(turn_parts)
+            await llm_cache.set(cache_key, {"content": final_output})
+
+            yield {
+                "success": True,
+                self.get_result_key(): final_output,
+                "error": [],
+            }
+
+        except Exception as e:
+            logger.error("Learner agent streaming failed", exc_info=True)
+            yield {
+                "success": False,
+                self.get_result_key(): None,
+                "error": [str(e)],
+            }
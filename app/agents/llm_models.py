@@ -14,3 +14,5 @@ class LLMModels:
     GEMINI_2_0_FLASH: Final[str] = "gemini-2.0-flash"
 
     DEFAULT: Final[str] = GEMINI_2_5_FLASH
+
+    GEMINI_EMBEDDING_001: Final[str] = "models/gemini-embedding-001"
@@ -4,20 +4,61 @@ Orchestrator Agent for the Exam Helper System
 Routes conversations to appropriate agent based on user requirement
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import copy
+import re
+from typing import Any, Dict, List, Optional, Tuple
  
 import structlog
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.tools import BaseTool
+from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel, Field
 
-from app.agents.agent_types import ORCHESTRATOR_NAME
+from app.agents.agent_types import EXPLAINER_AGENT_NAME, LEARNER_AGENT_NAME, ORCHESTRATOR_NAME
 from app.agents.base_agent import BaseAgent
 from app.agents.llm_models import LLMModels
+from app.agents.prompt_loader import load_prompt
 from app.agents.state import ExamHelperState
 from app.tools.exam_helper_tools import get_agent_tools
+from app.utils.llm_cache import get_llm_cache
 
 logger = structlog.get_logger(__name__)
 
+AMBIGUOUS_SELECTION = "ambiguous"
+
+# Maps the orchestrator's tool names back to the agents they delegate to.
+_TOOL_TO_AGENT: Dict[str, str] = {
+    "explainer": EXPLAINER_AGENT_NAME,
+    "learner": LEARNER_AGENT_NAME,
+}
+
+# Keyword versions of the DECISION RULES in prompt.md. Queries that match are routed
+# without an LLM call; everything else still goes through the react agent.
+_LEARN_RE = re.compile(
+    r"\b(16[ -]?marks?|exams?|university|competitive|important questions|notes"
+    r"|revision|long answers?|in[ -]depth|deep understanding)\b",
+    re.IGNORECASE,
+)
+_EXPLAIN_RE = re.compile(
+    r"\b(explain simply|from (the )?basics|like i['’]?m \d+|don['’]?t understand|confused)\b",
+    re.IGNORECASE,
+)
+
+# prompt.md tells the model to open its "If unclear" question with this marker.
+# Only a marked reply counts as a real ambiguity; it is never shown to the user.
+CLARIFY_MARKER = "[CLARIFY]"
+_GREETING_RE = re.compile(
+    r"^\s*(hi|hello|hey|good (morning|afternoon|evening)|thanks|thank you)\b[\s!.,]*$",
+    re.IGNORECASE,
+)
+
+# How each fan-out answer is labelled when both are shown together.
+_FANOUT_LABELS: Dict[str, str] = {
+    EXPLAINER_AGENT_NAME: "Simple explanation",
+    LEARNER_AGENT_NAME: "Exam-focused answer",
+}
+
 
 class OrchestratorResponse(BaseModel):
     """Response format for the orchestrator agent."""
@@ -27,64 +68,11 @@ class OrchestratorResponse(BaseModel):
     context_summary: str = Field(description="Summary of conversation context")
 
 
-ORCHESTRATOR_PROMPT = """
-You are the ORCHESTRATOR of an AI Learning System.
-
-YOUR PRIMARY RESPONSIBILITIES:
-1. Understand the student’s topic and difficulty level
-2. Identify their learning intent (basic understanding vs exam preparation)
-3. Decide which teaching agent to delegate to
-4. Maintain context across follow-up questions
-5. Keep your own responses brief — let agents handle teaching
-
-AVAILABLE TOOL AGENTS:
-
-1) explainer_agent  
-   - Explains concepts in the simplest possible way  
-   - Uses analogies, stories, real-life examples  
-   - Teaches like explaining to a 10-year-old  
-   - Avoids jargon unless absolutely necessary  
-
-2) learner_agent  
-   - Provides in-depth explanations  
-   - Includes structured notes  
-   - Gives exam-focused content  
-   - Provides 16-mark style answers  
-   - Includes diagrams (described), bullet points, definitions, and key points  
-   - Prepares student for competitive or university exams  
-
-DECISION RULES:
+ORCHESTRATOR_PROMPT = load_prompt(__package__)
 
-If the student:
-- Says “explain simply”, “I don’t understand”, “teach from basics”, “like I’m 5”, or sounds confused → delegate to explainer_agent
-- Mentions exams, 16 marks, important questions, university, competitive exams, notes, revision, or deep understanding → delegate to learner_agent
-- If unclear → ask:  
-  “Would you like a simple explanation or an exam-focused detailed answer?”
-
-CONVERSATION FLOW:
-
-1. First interaction:
-   - Greet briefly.
-   - Ask what topic they need help with and their goal (understanding vs exams).
-
-2. After user response:
-   - Identify intent.
-   - Delegate immediately to the correct agent.
-
-3. Follow-ups:
-   - Maintain topic continuity.
-   - Switch agents only if the user explicitly changes learning style.
-
-IMPORTANT:
-- Do NOT explain the concept yourself.
-- Do NOT mix both styles.
-- Always delegate once intent is clear.
-- Keep responses short and directive.
-- Focus on routing, not teaching.
-
-CURRENT STATE:
-- Intent: {intent}
-"""
+# Per-call state is appended after the static prompt, never interleaved with it,
+# so the whole of ORCHESTRATOR_PROMPT stays a stable, cacheable prefix.
+_CURRENT_STATE_HEADER = "\nCURRENT STATE:\n- Intent: "
 
 
 class OrchestratorAgent(BaseAgent):
@@ -94,7 +82,7 @@ class OrchestratorAgent(BaseAgent):
         self,
         agent_name: str = ORCHESTRATOR_NAME,
         api_key: Optional[str] = None,
-        temperature: float = 0.7,
+        temperature: float = 0.0,
         model_name: str = LLMModels.GEMINI_2_5_FLASH,
     ) -> None:
         super().__init__(
@@ -103,6 +91,127 @@ class OrchestratorAgent(BaseAgent):
             temperature=temperature,
             model_name=model_name,
         )
+        self._react_agents: Dict[str, Any] = {}
+
+    @staticmethod
+    def _get_sub_agents() -> Tuple[BaseAgent, BaseAgent]:
+        """Get the explainer and learner singletons, the same ones the tools use."""
+        from app.agents.agent_factory import get_agent
+
+        return get_agent(EXPLAINER_AGENT_NAME), get_agent(LEARNER_AGENT_NAME)
+
+    @staticmethod
+    def _sub_agent_state(state: Optional[ExamHelperState]) -> Optional[ExamHelperState]:
+        """Drop the current user turn from the history handed to a sub-agent.
+
+        The sub-agent gets the question as its query, so leaving it in the
+        history would repeat it in the CONVERSATION CONTEXT block.
+        """
+        if not state:
+            return state
+        history = state.get("messages", [])
+        if history and isinstance(history[-1], HumanMessage):
+            return {**state, "messages": history[:-1]}
+        return state
+
+    async def fanout(
+        self,
+        query: str,
+        state: Optional[ExamHelperState] = None,
+    ) -> Dict[str, Any]:
+        """Run the explainer and learner concurrently and return both results."""
+        explainer, learner = self._get_sub_agents()
+        sub_state = self._sub_agent_state(state)
+        results = await asyncio.gather(
+            explainer.process_query(query, sub_state),
+            learner.process_query(query, sub_state),
+            return_exceptions=True,
+        )
+
+        fanout_results: Dict[str, Any] = {}
+        for name, agent, result in zip(
+            (EXPLAINER_AGENT_NAME, LEARNER_AGENT_NAME), (explainer, learner), results
+        ):
+            if isinstance(result, BaseException):
+                result = {"success": False, agent.get_result_key(): None, "error": [str(result)]}
+            fanout_results[name] = result
+        return fanout_results
+
+    @staticmethod
+    def _combine_fanout(fanout_results: Dict[str, Any]) -> str:
+        """Join the successful fan-out answers into one labelled reply."""
+        explainer, learner = OrchestratorAgent._get_sub_agents()
+        sections = []
+        for name, agent in ((EXPLAINER_AGENT_NAME, explainer), (LEARNER_AGENT_NAME, learner)):
+            answer = fanout_results[name].get(agent.get_result_key())
+            if answer:
+                sections.append(f"{_FANOUT_LABELS[name]}:\n\n{answer}")
+        return "\n\n".join(sections)
+
+    @staticmethod
+    def _is_clarifying_question(messages: List[Any]) -> bool:
+        """Check whether the react agent's final reply carries the clarify marker."""
+        if not messages or not isinstance(messages[-1], AIMessage) or messages[-1].tool_calls:
+            return False
+        return CLARIFY_MARKER in messages[-1].text
+
+    @staticmethod
+    def _routing_decision(messages: List[Any]) -> Optional[Dict[str, Any]]:
+        """Reduce a react run to its decision: the tool call it made, or its direct reply."""
+        for msg in reversed(messages):
+            if isinstance(msg, AIMessage) and msg.tool_calls:
+                call = msg.tool_calls[-1]
+                return {"tool": call["name"], "args": call["args"]}
+        for msg in reversed(messages):
+            if isinstance(msg, AIMessage):
+                return {"reply": msg.text}
+        return None
+
+    @staticmethod
+    def _selected_agent(decision: Optional[Dict[str, Any]]) -> str:
+        """Name the agent a routing decision delegates to, or 'ambiguous' if it does not."""
+        if decision is None:
+            return AMBIGUOUS_SELECTION
+        return _TOOL_TO_AGENT.get(decision.get("tool", ""), AMBIGUOUS_SELECTION)
+
+    @staticmethod
+    async def _replay_decision(decision: Dict[str, Any], tools: List[BaseTool]) -> Optional[AIMessage]:
+        """Answer from a cached routing decision without another routing round trip.
+
+        Returns None if the decision names a tool that is no longer offered.
+        """
+        if "tool" not in decision:
+            return AIMessage(content=decision["reply"])
+        tool = next((tool for tool in tools if tool.name == decision["tool"]), None)
+        if tool is None:
+            return None
+        return AIMessage(content=await tool.ainvoke(decision["args"]))
+
+    @staticmethod
+    def _route_by_keywords(query: str, intent: str = "unknown") -> Optional[str]:
+        """Pick an agent from clear intent signals in the query, if there are any.
+
+        Explainer cues are explicit style requests ("explain simply", "I don't
+        understand"), so they win over exam topic words in the same query. Exam
+        words alone don't count as a style change while the conversation is in
+        explain mode; that case is left to the LLM's continuity rule.
+        """
+        if _EXPLAIN_RE.search(query):
+            return EXPLAINER_AGENT_NAME
+        if _LEARN_RE.search(query) and intent != "explain":
+            return LEARNER_AGENT_NAME
+        return None
+
+    def _get_react_agent(self, prompt: str, tools: List[BaseTool]) -> Any:
+        """Reuse one compiled react agent, and its SystemMessage, per distinct prompt.
+
+        The prompt only varies with the detected intent, so this stays small.
+        """
+        agent = self._react_agents.get(prompt)
+        if agent is None:
+            agent = create_react_agent(self.model, tools, prompt=SystemMessage(content=prompt))
+            self._react_agents[prompt] = agent
+        return agent
 
     def get_tools(self) -> List[BaseTool]:
         """Get agent-backed tools for the orchestrator."""
@@ -113,7 +222,7 @@ class OrchestratorAgent(BaseAgent):
 
     def get_prompt(self, state: Optional[ExamHelperState] = None) -> str:
         intent = state.get("user_intent", "unknown") if state else "unknown"
-        return ORCHESTRATOR_PROMPT.format(intent=intent)
+        return ORCHESTRATOR_PROMPT + _CURRENT_STATE_HEADER + intent + "\n"
 
     def get_response_format(self) -> type[BaseModel]:
         return OrchestratorResponse
@@ -125,23 +234,91 @@ class OrchestratorAgent(BaseAgent):
     ) -> Dict[str, Any]:
         """Process a query through the orchestrator."""
         try:
-            from langgraph.prebuilt import create_react_agent
+            history = state.get("messages", []) if state else []
+            intent = state.get("user_intent", "unknown") if state else "unknown"
+
+            selected_agent = self._route_by_keywords(query, intent) if query else None
+            if selected_agent is not None:
+                explainer, learner = self._get_sub_agents()
+                sub_agent = learner if selected_agent == LEARNER_AGENT_NAME else explainer
+                sub_result = await sub_agent.process_query(query, self._sub_agent_state(state))
+                if not sub_result["success"]:
+                    return {
+                        "success": False,
+                        "orchestrator_result": None,
+                        "error": sub_result.get("error", []),
+                    }
+
+                # Same shape as the react-agent path: the history plus this turn's reply.
+                messages = [*history, AIMessage(content=sub_result[sub_agent.get_result_key()])]
+                return {
+                    "success": True,
+                    "orchestrator_result": {"messages": messages},
+                    "messages": messages,
+                    "selected_agent": selected_agent,
+                    "error": [],
+                }
 
             tools = self.get_tools()
             prompt = self.get_prompt(state)
 
-            agent = create_react_agent(self.model, tools, prompt=prompt)
-
-            result = agent.invoke({"messages": state.get("messages", []) if state else []})
-
-            return {
+            # Routing is a classification step, so at temperature 0 the same
+            # prompt and history always produce the same delegation. Only that
+            # decision is cached; the delegated agent still answers each time.
+            llm_cache = get_llm_cache()
+            cache_key = llm_cache.cache_key(
+                self.model_name,
+                [prompt, *history],
+                self.temperature,
+                [tool.name for tool in tools],
+            )
+            cached = await llm_cache.get(cache_key)
+            replayed = None
+            if cached is not None:
+                decision = copy.deepcopy(cached["content"])
+                replayed = await self._replay_decision(decision, tools)
+
+            if replayed is not None:
+                result = {"messages": [*history, replayed]}
+            else:
+                agent = self._get_react_agent(prompt, tools)
+                result = await agent.ainvoke({"messages": history})
+                decision = self._routing_decision(result.get("messages", [])[len(history):])
+                # A call to an unknown tool only ends in ToolNode's error message,
+                # so it is not worth replaying.
+                if decision is not None and ("tool" not in decision or decision["tool"] in _TOOL_TO_AGENT):
+                    await llm_cache.set(cache_key, {"content": copy.deepcopy(decision)})
+
+            messages = result.get("messages", [])
+            new_messages = messages[len(history):]
+            selected_agent = self._selected_agent(decision)
+            fanout_results = None
+
+            # Instead of sending the clarifying question and waiting a turn,
+            # answer in both styles at once and let the student pick. Greetings
+            # have nothing to answer, so they get the question, minus its marker.
+            # The new reply keeps the question's id, so add_messages replaces it.
+            if selected_agent == AMBIGUOUS_SELECTION and self._is_clarifying_question(new_messages):
+                reply = messages[-1].text.replace(CLARIFY_MARKER, "").strip()
+                if query and not _GREETING_RE.match(query):
+                    fanout_results = await self.fanout(query, state)
+                    reply = self._combine_fanout(fanout_results) or reply
+                messages = [*messages[:-1], AIMessage(content=reply, id=messages[-1].id)]
+                result = {**result, "messages": messages}
+
+            response: Dict[str, Any] = {
                 "success": True,
                 "orchestrator_result": result,
-                "messages": result.get("messages", []),
+                "messages": messages,
+                "selected_agent": selected_agent,
                 "error": [],
             }
+            if fanout_results is not None:
+                response["fanout_results"] = fanout_results
+
+            return response
         except Exception as e:
-            logger.error("Orchestrator processing failed", error=str(e))
+            logger.error("Orchestrator processing failed", exc_info=True)
             return {
                 "success": False,
                 "orchestrator_result": None,
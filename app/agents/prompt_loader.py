@@ -0,0 +1,15 @@
+"""
+Loader for agent system prompts.
+
+Each agent package keeps its system prompt in a sidecar ``prompt.md`` file so
+prompts stay static text, with no interpolation inside the cacheable prefix.
+"""
+
+from functools import lru_cache
+from importlib import resources
+
+
+@lru_cache(maxsize=None)
+def load_prompt(package: str, name: str = "prompt.md") -> str:
+    """Read a prompt file shipped inside the given package, once per process."""
+    return (resources.files(package) / name).read_text(encoding="utf-8")
@@ -41,7 +41,7 @@ class AgentRegistry:
             display_name="Orchestrator Agent",
             agent_class=OrchestratorAgent,
             default_model=LLMModels.GEMINI_2_5_FLASH,
-            default_temperature=0.7,
+            default_temperature=0.0,
         )
 
     @classmethod
@@ -2,18 +2,23 @@
 Orchestrator Node for the Therapy Workflow.
 """
 
+import asyncio
 from typing import Any, Dict
 import structlog
 
 from app.agents.base_agent import BaseAgent
+from app.agents.agent_types import EXPLAINER_AGENT_NAME, LEARNER_AGENT_NAME
 from app.agents.state import ExamHelperState
 from app.utils.intent_detector import detect_intent
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
-from langgraph.prebuilt import create_react_agent
-from app.tools.exam_helper_tools import get_agent_tools
 
 logger = structlog.get_logger(__name__)
 
+_AGENT_TO_INTENT = {
+    EXPLAINER_AGENT_NAME: "explain",
+    LEARNER_AGENT_NAME: "learn",
+}
+
 
 class OrchestratorNode:
     """Node for processing conversations through the orchestrator agent."""
@@ -36,35 +41,35 @@ class OrchestratorNode:
             return "\n".join(parts)
         return str(content)
 
-    def process(self, state: ExamHelperState) -> Dict[str, Any]:
+    async def process(self, state: ExamHelperState) -> Dict[str, Any]:
         """Process the current state through the orchestrator."""
         try:
+            history = state.get("messages", [])
 
             user_msg = ""
-            for msg in reversed(state.get("messages", [])):
+            for msg in reversed(history):
                 if isinstance(msg, HumanMessage):
                     user_msg = msg.content
                     break
 
-            current_intent = state.get("user_intent", "unknown")
-
-            if current_intent == "unknown" and user_msg:
-                current_intent = detect_intent(user_msg)
-
-            tools = get_agent_tools()
-            prompt = self.orchestrator_agent.get_prompt(state)
+            result = await self.orchestrator_agent.process_query(user_msg, state)
+            if not result["success"]:
+                return {
+                    "orchestrator_result": None,
+                    "error": result.get("error", []),
+                }
 
-            agent = create_react_agent(
-                self.orchestrator_agent.model,
-                tools,
-                prompt=prompt,
+            current_intent = _AGENT_TO_INTENT.get(
+                result.get("selected_agent"), state.get("user_intent", "unknown")
             )
 
-            result = agent.invoke({"messages": state.get("messages", [])})
+            if current_intent == "unknown" and user_msg:
+                current_intent = await asyncio.to_thread(detect_intent, user_msg)
+
             orchestrator_response = ""
             ai_message=""
 
-            for msg in reversed(result.get("messages", [])):
+            for msg in reversed(result["messages"][len(history):]):
                 if isinstance(msg, ToolMessage) and msg.content:
                     orchestrator_response = msg.content
                     break
@@ -75,14 +80,14 @@ class OrchestratorNode:
                 orchestrator_response = ai_message
 
             return {
-                "messages": result.get("messages", []),
+                "messages": result["messages"],
                 "user_intent": current_intent,
                 "orchestrator_result": orchestrator_response,
             }
 
         except Exception as e:
             error_msg = f"Orchestrator node failed: {str(e)}"
-            logger.error("Orchestrator node failed", error=str(e))
+            logger.error("Orchestrator node failed", exc_info=True)
             return {
                 "orchestrator_result": None,
                 "error": [error_msg],
@@ -5,11 +5,13 @@ These tools wrap the actual therapy agent instances so the orchestrator
 delegates to them rather than duplicating agent logic inline.
 """
 
-import asyncio
+import functools
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 
+from app.utils import event_loop
+
 
 class ExamHelperInput(BaseModel):
     """Input schema for agent tools."""
@@ -18,15 +20,11 @@ class ExamHelperInput(BaseModel):
     context: str = Field(description="Conversation context/summary", default="")
 
 
-_agent_cache = {}
-
+def _get_agent(agent_name: str):
+    """Get the agent singleton from the factory. Imported lazily to avoid circular imports."""
+    from app.agents.agent_factory import get_agent
 
-def _get_agent(agent_class):
-    """Lazily instantiate and cache agent instances."""
-    name = agent_class.__name__
-    if name not in _agent_cache:
-        _agent_cache[name] = agent_class()
-    return _agent_cache[name]
+    return get_agent(agent_name)
 
 
 def _build_state_from_context(context: str) -> dict:
@@ -37,14 +35,14 @@ def _build_state_from_context(context: str) -> dict:
     return {"messages": messages}
 
 
-def _create_agent_tool_fn(agent_class):
+def _create_agent_tool_fn(agent_name: str):
     """Create a tool function that delegates to an actual agent instance."""
 
     def agent_tool_fn(message: str, context: str = "") -> str:
-        agent = _get_agent(agent_class)
+        agent = _get_agent(agent_name)
         state = _build_state_from_context(context)
 
-        result = asyncio.run(
+        result = event_loop.run(
              agent.process_query(message, state)
         )
 
@@ -52,21 +50,36 @@ def _create_agent_tool_fn(agent_class):
 
     return agent_tool_fn
 
-def _build_tools():
-    """Build all agent tools. Imports are deferred to avoid circular imports."""
-    from app.agents.explainer_agent.explainer_agent import ExplainerAgent
-    from app.agents.learner_agent.learner_agent import LearnerAgent
 
+def _create_agent_tool_coro(agent_name: str):
+    """Create an async tool function so async callers await the agent on their own loop."""
+
+    async def agent_tool_coro(message: str, context: str = "") -> str:
+        agent = _get_agent(agent_name)
+        state = _build_state_from_context(context)
+
+        result = await agent.process_query(message, state)
+
+        return result.get(agent.get_result_key(), "")
+
+    return agent_tool_coro
+
+@functools.lru_cache(maxsize=1)
+def _build_tools():
+    """Build all agent tools once per process. Imports are deferred to avoid circular imports."""
+    from app.agents.agent_types import EXPLAINER_AGENT_NAME, LEARNER_AGENT_NAME
 
     explainer = StructuredTool.from_function(
-        func=_create_agent_tool_fn(ExplainerAgent),
+        func=_create_agent_tool_fn(EXPLAINER_AGENT_NAME),
+        coroutine=_create_agent_tool_coro(EXPLAINER_AGENT_NAME),
         name="explainer",
         description="Use when user wants a certain concept to be explained.",
         args_schema=ExamHelperInput,
     )
 
     learner = StructuredTool.from_function(
-        func=_create_agent_tool_fn(LearnerAgent),
+        func=_create_agent_tool_fn(LEARNER_AGENT_NAME),
+        coroutine=_create_agent_tool_coro(LEARNER_AGENT_NAME),
         name="learner",
         description="Use when user asks for material to study a certain topic",
         args_schema=ExamHelperInput,
@@ -1,3 +1,4 @@
+import functools
 import os
 from typing import List
 
@@ -8,6 +9,13 @@ load_dotenv()
 
 from langchain_core.tools import tool
 
+
+@functools.lru_cache(maxsize=1)
+def _get_firecrawl_client() -> Firecrawl:
+    """Create the Firecrawl client once so its HTTP session is reused across searches."""
+    return Firecrawl(api_key=os.getenv("FIRECRAWL_API_KEY"))
+
+
 @tool
 def firecrawl_tool(query: str, num_results: int = 1) -> str:
     """
@@ -41,7 +49,7 @@ def firecrawl_tool(query: str, num_results: int = 1) -> str:
         "No relevant sources found."
     """
     
-    app = Firecrawl(api_key=os.getenv("FIRECRAWL_API_KEY"))
+    app = _get_firecrawl_client()
     
     print("Starting firecrawl search with query ",query)
 
@@ -74,5 +82,10 @@ def firecrawl_tool(query: str, num_results: int = 1) -> str:
 
     return "\n\n".join(contents)
 
+@functools.lru_cache(maxsize=1)
+def _build_learner_tools():
+    return (firecrawl_tool,)
+
+
 def get_learner_tools():
-    return [firecrawl_tool]
+    return list(_build_learner_tools())
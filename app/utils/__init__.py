@@ -4,9 +4,14 @@ Utils module for Exam helper system
 
 from .intent_detector import detect_intent
 from .conversation_store import ConversationStore, get_conversation_store
+from .llm_cache import LLMCache, get_llm_cache
+from .semantic_cache import SemanticCache
 
 __all__ = [
     "detect_intent",
     "ConversationStore",
     "get_conversation_store",
+    "LLMCache",
+    "get_llm_cache",
+    "SemanticCache",
 ]
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+Event loop helpers.
+
+Uses uvloop's faster event loop when it is installed. uvloop is a dependency
+everywhere except Windows, which it does not support; there the standard
+asyncio loop is used.
+"""
+
+import asyncio
+from typing import Any, Callable, Coroutine, Optional, TypeVar
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+T = TypeVar("T")
+
+
+def get_loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Get the event loop factory to use, or None for the asyncio default."""
+    return uvloop.new_event_loop if uvloop is not None else None
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion like asyncio.run, on uvloop when available."""
+    with asyncio.Runner(loop_factory=get_loop_factory()) as runner:
+        return runner.run(coro)
@@ -0,0 +1,139 @@
+"""
+In-memory LLM response cache.
+
+Caches responses of deterministic (temperature 0) LLM calls, keyed on the
+model, the full message list and the tools offered to the model.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TTL_SECONDS = 3600
+
+
+class MemoryLRU:
+    """Thread-safe, size-bounded LRU mapping of key -> (expires_at, value)."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, expires_at: float, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _serialize_message(message: Any) -> Any:
+    """Reduce a message to the parts that influence the model's output."""
+    if isinstance(message, dict):
+        return [message.get("role"), message.get("content")]
+    if hasattr(message, "content"):
+        return [
+            getattr(message, "type", None),
+            message.content,
+            getattr(message, "tool_calls", None) or None,
+        ]
+    return [None, message]
+
+
+class LLMCache:
+    """Exact-match cache for LLM responses with a per-entry TTL."""
+
+    def __init__(
+        self,
+        backend: Optional[MemoryLRU] = None,
+        ttl: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.backend = backend or MemoryLRU()
+        self.ttl = ttl
+
+    @staticmethod
+    def cache_key(
+        model_name: str,
+        messages: Sequence[Any],
+        temperature: float,
+        tools: Iterable[str] = (),
+    ) -> Optional[str]:
+        """Build a cache key for a call, or None if the call is not cacheable.
+
+        Only temperature 0 calls are cached; sampled responses are expected to vary.
+        """
+        if temperature > 0:
+            return None
+
+        payload = json.dumps(
+            {
+                "model": model_name,
+                "messages": [_serialize_message(m) for m in messages],
+                "tools": sorted(tools),
+            },
+            default=str,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: Optional[str]) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expiry."""
+        if key is None:
+            return None
+
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self.backend.delete(key)
+            return None
+
+        logger.debug("LLM cache hit", key=key)
+        return value
+
+    async def set(self, key: Optional[str], value: Any) -> None:
+        """Store value under key for the configured TTL."""
+        if key is None:
+            return
+        self.backend.set(key, time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self.backend.clear()
+
+
+_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Get the global LLM response cache instance."""
+    global _cache
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
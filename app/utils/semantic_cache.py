@@ -0,0 +1,101 @@
+"""
+In-memory semantic response cache.
+
+Matches paraphrased queries ("what is an API?" vs "explain APIs please") by
+cosine similarity of their embeddings, so near-duplicate questions can be
+answered without another LLM call.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import structlog
+from langchain_core.embeddings import Embeddings
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 3600
+
+
+class SemanticCache:
+    """Cosine-similarity cache over L2-normalised query embeddings.
+
+    Vectors live in a preallocated matrix used as a ring buffer, so a lookup is
+    a single matrix-vector product (inner product == cosine similarity).
+    Entries expire after ttl seconds, like LLMCache entries.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._matrix: Optional[np.ndarray] = None
+        self._expires_at: Optional[np.ndarray] = None
+        self._values: List[Any] = []
+        self._next_slot = 0
+        self._lock = threading.Lock()
+
+    async def embed(self, query: str) -> np.ndarray:
+        """Embed and L2-normalise a query."""
+        vector = np.asarray(await self.embeddings.aembed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _search(self, vector: np.ndarray) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            if self._matrix is None or not self._values:
+                return None
+            count = len(self._values)
+            scores = self._matrix[:count] @ vector
+            scores[self._expires_at[:count] <= time.monotonic()] = -np.inf
+            best = int(np.argmax(scores))
+            return float(scores[best]), self._values[best]
+
+    async def search(self, vector: np.ndarray) -> Optional[Any]:
+        """Return the value stored for the most similar query above the threshold."""
+        match = await asyncio.to_thread(self._search, vector)
+        if match is None:
+            return None
+
+        score, value = match
+        if score < self.threshold:
+            return None
+
+        logger.debug("Semantic cache hit", similarity=score)
+        return value
+
+    def add(self, vector: np.ndarray, value: Any) -> None:
+        """Store a value, evicting the oldest entry once the cache is full."""
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._expires_at = np.zeros(self.max_entries)
+
+            slot = self._next_slot
+            self._matrix[slot] = vector
+            self._expires_at[slot] = time.monotonic() + self.ttl
+            if slot < len(self._values):
+                self._values[slot] = value
+            else:
+                self._values.append(value)
+            self._next_slot = (slot + 1) % self.max_entries
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._matrix = None
+            self._expires_at = None
+            self._values = []
+            self._next_slot = 0
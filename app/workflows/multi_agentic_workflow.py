@@ -15,6 +15,7 @@ from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 
 from app.agents.state import ExamHelperState, get_initial_state
+from app.utils import event_loop
 from app.utils.conversation_store import get_conversation_store
 from app.nodes.orchestrator_node import OrchestratorNode
 
@@ -151,7 +152,7 @@ class MultiAgentWorkflow:
             }
 
         except Exception as e:
-            logger.error("Workflow processing failed", error=str(e))
+            logger.error("Workflow processing failed", exc_info=True)
             return {
                 "success": False,
                 "response": "Hi there! What's up?",
@@ -159,36 +160,12 @@ class MultiAgentWorkflow:
             }
 
     def process_query(self, user_message: str) -> Dict[str, Any]:
-        """Process a query synchronously through the workflow."""
-        try:
-            state = self._get_current_state()
-
-            state["messages"] = list(state.get("messages", [])) + [
-                HumanMessage(content=user_message)
-            ]
-            state["user_query"] = user_message
-
-            final_state = self.workflow.invoke(state, self.config)
-
-            self._state = dict(final_state)
-
-            self._save_conversation()
-
-            response = final_state.get("orchestrator_result", "Hi there! What's up?")
+        """Process a query synchronously through the workflow.
 
-            return {
-                "success": True,
-                "response": response,
-                "state": final_state,
-            }
-
-        except Exception as e:
-            logger.error("Workflow processing failed", error=str(e))
-            return {
-                "success": False,
-                "response": "Hi there! What's up?",
-                "error": str(e),
-            }
+        The orchestrator node is async, so this drives the async path on a
+        private event loop rather than a blocking graph invoke.
+        """
+        return event_loop.run(self.process_query_async(user_message))
 
     def chat(self, user_message: str) -> str:
         """Simple chat interface that returns just the response string."""
@@ -210,8 +187,8 @@ class MultiAgentWorkflow:
 
             return "Hi there! What's up?"
 
-        except Exception as e:
-            logger.error("Failed to get greeting", error=str(e))
+        except Exception:
+            logger.error("Failed to get greeting", exc_info=True)
             return "Hi there! What's up?"
 
     def reset(self) -> None: